@@ -13,7 +13,8 @@ import typer
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
 
-from connect4evolution.sparse_q_learning.trainer import Trainer, TrainingConfig
+from connect4evolution.sparse_q_learning.trainer import Trainer
+from connect4evolution.sparse_q_learning.training_config import TrainingConfig
 
 app = typer.Typer(
     help="Connect4Evolution: Reinforcement learning approaches for Connect Four",
@@ -54,9 +55,10 @@ def play(
 def train(
     agent: AgentType = typer.Argument(..., help="Agent type to train"),
     episodes: int = typer.Option(100000, help="Number of training episodes"),
-    output: str = typer.Option("models/model.json", help="Output path for trained model"),
+    output: str = typer.Option("models/model.npz", help="Output path for trained model"),
     learning_rate: float = typer.Option(0.1, help="Learning rate for training"),
     self_play: bool = typer.Option(False, help="Whether to use self-play for training"),
+    num_envs: int = typer.Option(1, help="Number of games to play side by side"),
 ):
     """
     Train an AI to master Connect Four! 📚
@@ -78,6 +80,7 @@ def train(
             model_path=output,
             render_every=max(episodes // 20, 1000),  # Show progress regularly
             save_every=max(episodes // 10, 5000),  # Save checkpoints
+            num_envs=num_envs,
         )
 
         # Create and run our trainer
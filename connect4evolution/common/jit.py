@@ -0,0 +1,23 @@
+"""
+Optional Numba support for our hot numeric kernels.
+
+Numba can compile small number-crunching functions down to machine code,
+but it's a hefty dependency. We use it when it's installed and otherwise
+fall back to running the very same functions as plain Python. ⚡
+"""
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for ``numba.njit`` that leaves the function untouched."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+__all__ = ["NUMBA_AVAILABLE", "njit"]
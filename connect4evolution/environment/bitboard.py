@@ -0,0 +1,94 @@
+"""
+Bitboard helpers for Connect Four.
+
+Instead of a grid of cells, a bitboard packs the whole board into a single
+integer. Every column gets ``rows + 1`` bits, bottom cell first, with the
+extra bit on top acting as a sentinel so pieces never "leak" into the next
+column when we shift. For the standard 6x7 board the layout looks like this:
+
+    6 13 20 27 34 41 48   <- sentinel row (always empty)
+    5 12 19 26 33 40 47
+    4 11 18 25 32 39 46
+    3 10 17 24 31 38 45
+    2  9 16 23 30 37 44
+    1  8 15 22 29 36 43
+    0  7 14 21 28 35 42
+
+Checking for four in a row then becomes a handful of shifts and ANDs. 🧮
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from ..common.jit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def is_win(position: int, rows: int) -> bool:
+    """
+    Check whether the stones in ``position`` contain four in a row.
+
+    Each shift lines up neighbouring cells in one direction:
+    1 is vertical, ``rows + 1`` horizontal and ``rows`` / ``rows + 2`` the diagonals.
+    """
+    for shift in (1, rows + 1, rows, rows + 2):
+        pairs = position & (position >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+@njit(cache=True)
+def winning_mask(position: int, rows: int) -> int:
+    """
+    Find every stone in ``position`` that is part of four in a row.
+
+    For each direction, ``quads`` marks the first stone of each run of four;
+    shifting it back up three times fills in the rest of the run.
+    """
+    mask = 0
+    for shift in (1, rows + 1, rows, rows + 2):
+        pairs = position & (position >> shift)
+        quads = pairs & (pairs >> (2 * shift))
+        mask |= quads | (quads << shift) | (quads << (2 * shift)) | (quads << (3 * shift))
+    return mask
+
+
+# Compile our kernels (or load them from Numba's cache) at import time,
+# so the first game of a training run doesn't stall on compilation.
+if NUMBA_AVAILABLE:
+    is_win(0, 6)
+    winning_mask(0, 6)
+
+
+def to_array(player1: int, player2: int, rows: int, cols: int) -> np.ndarray:
+    """
+    Decode two bitboards into the familiar ``rows x cols`` grid.
+
+    Row 0 is the top of the board, matching what the renderer draws.
+    """
+    height = rows + 1
+    shifts = np.array(
+        [[col * height + (rows - 1 - row) for col in range(cols)] for row in range(rows)],
+        dtype=np.int64,
+    )
+    board = (np.int64(player1) >> shifts) & 1
+    board += 2 * ((np.int64(player2) >> shifts) & 1)
+    return board.astype(int)
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(rows: int, cols: int) -> tuple[tuple[tuple[int, ...], ...], int]:
+    """
+    Random 64-bit keys for Zobrist hashing a board of the given size.
+
+    Returns one key per (player, cell) pair, indexed as ``keys[player - 1][row * cols + col]``,
+    plus a key that is toggled whenever the side to move changes. The keys come from a
+    fixed seed, so the same position always hashes to the same value across runs and
+    saved Q-tables stay valid.
+    """
+    cells = rows * cols
+    values = np.random.SeedSequence(0).generate_state(2 * cells + 1, dtype=np.uint64).tolist()
+    keys = (tuple(values[:cells]), tuple(values[cells : 2 * cells]))
+    return keys, values[-1]
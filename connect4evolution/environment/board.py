@@ -5,12 +5,12 @@ This module provides the core game mechanics, handling moves,
 win detection, and board state management.
 """
 
-from typing import Optional, Tuple
+import random
+from typing import Optional
 
-import numpy as np
-
-from .player import Player
-from .state import GameState
+from . import bitboard
+from .player import EMPTY, P1, Player
+from .state import BoardSnapshot, GameState
 
 
 class ConnectFourBoard:
@@ -22,8 +22,15 @@ class ConnectFourBoard:
     * Validates moves
     * Checks for wins
     * Manages turn order
+
+    Under the hood the board lives in two integers: a mask of every occupied
+    cell and the stones of the player to move (see ``bitboard.py``).
     """
 
+    # Internally players are plain ints; these turn them back into Players
+    _PLAYERS = (Player.EMPTY, Player.PLAYER_1, Player.PLAYER_2)
+    _WINNERS = (None, Player.PLAYER_1, Player.PLAYER_2)
+
     def __init__(self, rows: int = 6, cols: int = 7):
         """
         Initialize an empty Connect Four board.
@@ -32,8 +39,19 @@ class ConnectFourBoard:
             rows: Number of rows in the board (default: 6)
             cols: Number of columns in the board (default: 7)
         """
+        if cols * (rows + 1) > 64:
+            raise ValueError("Board is too large to fit in a 64-bit bitboard")
+
         self.rows = rows
         self.cols = cols
+
+        # Precompute the bits we need for each column (see bitboard.py for the layout)
+        height = rows + 1
+        self._col_bottom = [1 << (col * height) for col in range(cols)]
+        self._col_top = [1 << (col * height + rows - 1) for col in range(cols)]
+        self._full_mask = sum(((1 << rows) - 1) << (col * height) for col in range(cols))
+        self._top_mask = sum(self._col_top)
+        self._zobrist, self._side_hash = bitboard.zobrist_keys(rows, cols)
         self._reset()
 
     def make_move(self, column: int) -> bool:
@@ -46,100 +64,151 @@ class ConnectFourBoard:
         Returns:
             bool: True if the move was valid and made, False otherwise
         """
-        if self._game_over or column not in self.get_valid_moves():
+        if self._game_over or not 0 <= column < self.cols or self._mask & self._col_top[column]:
             return False
 
-        # Find the lowest empty cell in the column
-        for row in range(self.rows - 1, -1, -1):
-            if self._board[row][column] == Player.EMPTY.value:
-                self._board[row][column] = self._current_player.value
-                self._last_move = (row, column)
-                break
+        # Adding the column's bottom bit carries up to the lowest empty cell
+        new_mask = self._mask | (self._mask + self._col_bottom[column])
+        played = new_mask ^ self._mask
+        stones = self._position | played
+
+        bit = played.bit_length() - 1
+        row = self.rows - 1 - bit % (self.rows + 1)
+        self._last_move = (row, column)
+        self._mask = new_mask
+        self._valid_cache = None
+        self._state_cache = None
+
+        # Keep the Zobrist hashes in sync: add the new stone and flip the side to move.
+        # The mirrored hash is what this position would hash to if flipped left-right.
+        keys = self._zobrist[self._current - 1]
+        self._hash ^= keys[row * self.cols + column] ^ self._side_hash
+        self._mirrored_hash ^= keys[row * self.cols + self.cols - 1 - column] ^ self._side_hash
+        # From now on we track the stones of the player whose turn it is next
+        self._position = stones ^ new_mask
 
         # Check for win
-        if self._check_win(self._last_move):
+        if self._check_win(stones):
             self._game_over = True
-            self._winner = self._current_player
+            self._winner = self._current
+            # Remember which stones won, so nobody has to search for them again
+            self._winning_mask = bitboard.winning_mask(stones, self.rows)
         # Check for draw
-        elif not self.get_valid_moves():
+        elif new_mask == self._full_mask:
             self._game_over = True
 
-        # Switch players
-        self._current_player = self._current_player.next_player()
+        # Switch players (1 <-> 2)
+        self._current = 3 - self._current
         return True
 
+    def step_with_random_opponent(
+        self, column: int, rng: random.Random
+    ) -> tuple[bool, BoardSnapshot]:
+        """
+        Make a move and let a random opponent answer it, all in one step.
+
+        Against a random opponent only our own turns matter, so the returned
+        snapshot is our next turn (or the end of the game, whoever ended it).
+
+        Returns:
+            tuple: (whether our move was valid, snapshot after the opponent's reply)
+        """
+        valid = self.make_move(column)
+        if valid and not self._game_over:
+            self.make_move(rng.choice(self._valid_moves()))
+        return valid, self.snapshot()
+
     def get_valid_moves(self) -> list[int]:
         """Return a list of columns where a piece can be dropped."""
-        return [col for col, cell in enumerate(self._board[0]) if cell == Player.EMPTY.value]
+        return list(self._valid_moves())
 
     def get_state(self) -> GameState:
-        """Return the current game state."""
+        """
+        Return the current game state.
+
+        GameStates are immutable, so we build one at most once per position
+        and hand the same object back until the next move. That also keeps
+        its decoded board grid around for repeated redraws.
+        """
+        if self._state_cache is None:
+            self._state_cache = self._build_state()
+        return self._state_cache
+
+    def _build_state(self) -> GameState:
+        """Put together a GameState for the current position."""
         return GameState(
-            board=self._board.copy(),
-            current_player=self._current_player,
+            bitboards=self.state_key(),
+            current_player=self._PLAYERS[self._current],
             last_move=self._last_move,
             game_over=self._game_over,
-            winner=self._winner,
+            winner=self._WINNERS[self._winner],
+            zobrist_hash=self._hash,
+            mirrored_hash=self._mirrored_hash,
+            valid_moves=self._valid_moves(),
+            shape=(self.rows, self.cols),
+            winning_mask=self._winning_mask,
         )
 
+    def snapshot(self) -> BoardSnapshot:
+        """
+        Return a cheap, tuple-based view of the current state.
+
+        This is what the training loop uses on every move; build a full
+        GameState with get_state() only when you need one (e.g. for rendering).
+        """
+        return BoardSnapshot(
+            self._mask,
+            self._position,
+            self._PLAYERS[self._current],
+            self._last_move,
+            self._game_over,
+            self._WINNERS[self._winner],
+            self._hash,
+            self._mirrored_hash,
+            self._valid_moves(),
+        )
+
+    def state_key(self) -> tuple[int, int]:
+        """
+        Return the position as (player 1 stones, player 2 stones) bitboards.
+
+        Unlike the Zobrist hash this can never collide, which makes it a handy
+        exact key for tables that want one.
+        """
+        if self._current == P1:
+            return self._position, self._position ^ self._mask
+        return self._position ^ self._mask, self._position
+
     def reset(self) -> None:
         """Reset the board to its initial state."""
         self._reset()
 
     def _reset(self) -> None:
         """Internal method to reset the game state."""
-        self._board = np.zeros((self.rows, self.cols), dtype=int)
-        self._current_player = Player.PLAYER_1
+        self._mask = 0  # Every occupied cell
+        self._position = 0  # Stones of the player to move
+        self._hash = 0  # Zobrist hash of the position
+        self._mirrored_hash = 0  # Zobrist hash of the left-right mirrored position
+        self._current = P1
         self._last_move = None
         self._game_over = False
-        self._winner = None
-
-    def _check_win(self, last_move: Optional[Tuple[int, int]]) -> bool:
+        self._winner = EMPTY
+        self._winning_mask = 0  # Stones making up the winning four, once there is one
+        self._valid_cache: Optional[tuple[int, ...]] = None  # Valid moves, until the next move
+        self._state_cache: Optional[GameState] = None  # Last get_state(), until the next move
+
+    def _valid_moves(self) -> tuple[int, ...]:
+        """Find the columns whose top cell is still free (worked out once per move)."""
+        if self._valid_cache is None:
+            free = self._top_mask & ~self._mask
+            self._valid_cache = tuple(col for col, top in enumerate(self._col_top) if free & top)
+        return self._valid_cache
+
+    def _check_win(self, stones: int) -> bool:
         """
-        Check if the last move resulted in a win.
+        Check if the given stones contain four in a row.
 
-        This method checks all possible winning directions from the last move made,
-        which is more efficient than checking the entire board.
+        With bitboards this is just a few shifts and ANDs per direction,
+        which is far cheaper than walking the grid cell by cell.
         """
-        if not last_move:
-            return False
-
-        row, col = last_move
-        player = self._board[row][col]
-
-        # Define direction pairs to check
-        directions = [
-            [(0, 1), (0, -1)],  # Horizontal
-            [(1, 0), (-1, 0)],  # Vertical
-            [(1, 1), (-1, -1)],  # Diagonal /
-            [(1, -1), (-1, 1)],  # Diagonal \
-        ]
-
-        # Check each direction pair
-        for dir1, dir2 in directions:
-            count = 1
-            # Check first direction
-            count += self._count_consecutive(row, col, dir1[0], dir1[1], player)
-            # Check opposite direction
-            count += self._count_consecutive(row, col, dir2[0], dir2[1], player)
-            if count >= 4:
-                return True
-        return False
-
-    def _count_consecutive(
-        self, row: int, col: int, row_dir: int, col_dir: int, player: int
-    ) -> int:
-        """Count consecutive pieces in a direction."""
-        count = 0
-        current_row, current_col = row + row_dir, col + col_dir
-
-        while (
-            0 <= current_row < self.rows
-            and 0 <= current_col < self.cols
-            and self._board[current_row][current_col] == player
-        ):
-            count += 1
-            current_row += row_dir
-            current_col += col_dir
-
-        return count
+        return bitboard.is_win(stones, self.rows)
@@ -7,6 +7,9 @@ and provides a clean enumeration for player turns.
 
 from enum import Enum
 
+# Plain int versions of the cell states, for hot paths where Enum lookups add up
+EMPTY, P1, P2 = 0, 1, 2
+
 
 class Player(Enum):
     """
@@ -8,6 +8,7 @@ Think of it as our game's artist, bringing the abstract game state to life! 🎨
 
 from typing import Optional, Tuple
 
+import numpy as np
 import pygame
 
 from .player import Player
@@ -52,6 +53,10 @@ class ConnectFourRenderer:
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("Connect Four Evolution")
 
+        # Cached board with every token drawn so far, so idle frames just blit it
+        self._board_surface: Optional[pygame.Surface] = None
+        self._drawn_board: Optional[np.ndarray] = None
+
         # Animation state
         self.dropping_token = None
         self.drop_y = 0
@@ -65,24 +70,14 @@ class ConnectFourRenderer:
             state: Current game state
             hover_col: Column where the mouse is hovering (for preview)
         """
-        self.screen.fill(self.COLORS["BACKGROUND"])
-
-        # Draw the board background
-        pygame.draw.rect(
-            self.screen,
-            self.COLORS["BOARD"],
-            (0, self.cell_size, self.width, self.height - self.cell_size),
-        )
+        # Draw the board and all tokens (only cells that changed get redrawn)
+        self._update_board_surface(state)
+        self.screen.blit(self._board_surface, (0, 0))
 
         # Draw hover preview
         if hover_col is not None and not state.game_over:
             self._draw_hover_preview(hover_col, state.current_player)
 
-        # Draw all tokens
-        for row in range(self.rows):
-            for col in range(self.cols):
-                self._draw_cell(row, col, state.board[row][col])
-
         # Highlight winning tokens if game is over
         if state.game_over and state.winner and state.last_move:
             self._highlight_win(state)
@@ -116,7 +111,24 @@ class ConnectFourRenderer:
 
         return running, selected_col
 
-    def _draw_cell(self, row: int, col: int, player_value: int) -> None:
+    def _update_board_surface(self, state: GameState) -> None:
+        """Bring the cached board surface up to date with the given state."""
+        if self._board_surface is None:
+            self._board_surface = pygame.Surface((self.width, self.height))
+            self._board_surface.fill(self.COLORS["BACKGROUND"])
+            pygame.draw.rect(
+                self._board_surface,
+                self.COLORS["BOARD"],
+                (0, self.cell_size, self.width, self.height - self.cell_size),
+            )
+            self._drawn_board = np.full((self.rows, self.cols), -1)
+
+        # Moves, undos and resets all show up as cells that differ from what we drew
+        for row, col in np.argwhere(state.board != self._drawn_board):
+            self._draw_cell(self._board_surface, int(row), int(col), state.board[row][col])
+        self._drawn_board = state.board.copy()
+
+    def _draw_cell(self, surface: pygame.Surface, row: int, col: int, player_value: int) -> None:
         """Draw a single cell with a token if present."""
         color = {
             Player.EMPTY.value: self.COLORS["EMPTY"],
@@ -130,7 +142,7 @@ class ConnectFourRenderer:
         )
 
         radius = int(self.cell_size * 0.4)
-        pygame.draw.circle(self.screen, color, center, radius)
+        pygame.draw.circle(surface, color, center, radius)
 
     def _draw_hover_preview(self, col: int, current_player: Player) -> None:
         """Draw a preview token at the top of the selected column."""
@@ -145,43 +157,20 @@ class ConnectFourRenderer:
 
     def _highlight_win(self, state: GameState) -> None:
         """Highlight the winning tokens."""
-        if not state.last_move:
-            return
-
-        row, col = state.last_move
-        player = state.board[row][col]
-
-        # Define directions to check
-        directions = [
-            [(0, 1), (0, -1)],  # Horizontal
-            [(1, 0), (-1, 0)],  # Vertical
-            [(1, 1), (-1, -1)],  # Diagonal /
-            [(1, -1), (-1, 1)],  # Diagonal \
-        ]
-
-        # Check each direction for a win
-        for dir1, dir2 in directions:
-            tokens = [(row, col)]
-
-            # Check both directions
-            for dr, dc in [dir1, dir2]:
-                r, c = row + dr, col + dc
-                while 0 <= r < self.rows and 0 <= c < self.cols and state.board[r][c] == player:
-                    tokens.append((r, c))
-                    r, c = r + dr, c + dc
-
-            # If we found a win, highlight these tokens
-            if len(tokens) >= 4:
-                for r, c in tokens:
-                    center = (
-                        c * self.cell_size + self.cell_size // 2,
-                        (r + 1) * self.cell_size + self.cell_size // 2,
-                    )
-                    radius = int(self.cell_size * 0.4)
-                    pygame.draw.circle(
-                        self.screen, self.COLORS["WIN_HIGHLIGHT"], center, radius + 4
-                    )
-                return
+        # The board already recorded exactly which stones make up the four in a row
+        mask = state.winning_mask
+        radius = int(self.cell_size * 0.4)
+
+        while mask:
+            bit = mask & -mask  # Lowest set bit
+            col, height = divmod(bit.bit_length() - 1, self.rows + 1)
+            row = self.rows - 1 - height
+            center = (
+                col * self.cell_size + self.cell_size // 2,
+                (row + 1) * self.cell_size + self.cell_size // 2,
+            )
+            pygame.draw.circle(self.screen, self.COLORS["WIN_HIGHLIGHT"], center, radius + 4)
+            mask ^= bit
 
     def cleanup(self) -> None:
         """Clean up PyGame resources."""
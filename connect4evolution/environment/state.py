@@ -5,39 +5,71 @@ This module provides a clean, immutable representation of the game state,
 making it perfect for use in our learning algorithms and game analysis.
 """
 
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional, Tuple, Union
 
 import numpy as np
 
+from .bitboard import to_array
 from .player import Player
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False, slots=True)
 class GameState:
     """
     Represents the complete state of a Connect Four game.
 
     This immutable state representation includes:
-    * The current board configuration
+    * The current board configuration (as one bitboard per player)
     * Whose turn it is
     * The last move made
     * Whether the game is over
-    * Who won (if anyone)
+    * Who won (if anyone), and with which stones
+    * Zobrist hashes identifying the position (and its mirror image)
+    * Which columns can still be played
 
     Using a frozen dataclass ensures our game states can't be accidentally modified,
-    which is crucial for our learning algorithms.
+    which is crucial for our learning algorithms. Slots keep each state small,
+    and two states are equal when they describe the same position (same hash).
     """
 
-    board: np.ndarray
+    bitboards: Tuple[int, int]  # (player 1 stones, player 2 stones)
     current_player: Player
     last_move: Optional[Tuple[int, int]]  # (row, col)
     game_over: bool
     winner: Optional[Player]
+    zobrist_hash: int  # Maintained incrementally by the board
+    mirrored_hash: int  # Zobrist hash of the left-right mirrored board
+    valid_moves: tuple[int, ...]  # Computed once by the board
+    shape: Tuple[int, int] = (6, 7)  # (rows, cols)
+    winning_mask: int = 0  # Bitboard of the winning four in a row, if any
+    _board: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    @property
+    def board(self) -> np.ndarray:
+        """
+        The board as a rows x cols grid of player values.
+
+        Decoded from the bitboards the first time someone asks for it, since
+        the learning code never needs it and only the renderer does.
+        """
+        if self._board is None:
+            object.__setattr__(self, "_board", to_array(*self.bitboards, *self.shape))
+        return self._board
+
+    def __eq__(self, other: object) -> bool:
+        """Two states are the same when they hash to the same position."""
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self.zobrist_hash == other.zobrist_hash
+
+    def __hash__(self) -> int:
+        """Hash by the Zobrist key the board already computed for us."""
+        return self.zobrist_hash
 
     def get_valid_moves(self) -> list[int]:
         """Returns a list of valid moves (columns) for the current state."""
-        return [col for col, cell in enumerate(self.board[0]) if cell == Player.EMPTY.value]
+        return list(self.valid_moves)
 
     def __str__(self) -> str:
         """
@@ -70,3 +102,31 @@ class GameState:
         )
 
         return f"{board_str}\n{status}\nCurrent player: {self.current_player}"
+
+
+class BoardSnapshot(NamedTuple):
+    """
+    A lightweight, tuple-based view of the board for the training loop.
+
+    It carries everything our learning code looks at, without the extras
+    of a full GameState. Think of it as a quick glance at the board rather
+    than a proper photograph. 📸
+    """
+
+    mask: int  # Every occupied cell
+    position: int  # Stones of the player to move
+    current_player: Player
+    last_move: Optional[Tuple[int, int]]  # (row, col)
+    game_over: bool
+    winner: Optional[Player]
+    zobrist_hash: int
+    mirrored_hash: int
+    valid_moves: tuple[int, ...]
+
+    def get_valid_moves(self) -> list[int]:
+        """Returns a list of valid moves (columns) for this snapshot."""
+        return list(self.valid_moves)
+
+
+# Anything our agents can look at to decide and learn
+StateLike = Union[GameState, BoardSnapshot]
@@ -7,14 +7,30 @@ experience what moves work best! 🎮
 """
 
 import random
+from itertools import chain
+from typing import List, Optional, Tuple
 
 import numpy as np
 
-from ..environment.state import GameState
+from ..common.jit import njit
+from ..environment.state import StateLike
 from .config import AgentConfig
 from .memory import SparseQTable
 
 
+@njit(cache=True)
+def td_update(
+    q_values: np.ndarray,
+    action: int,
+    reward: float,
+    next_q: float,
+    learning_rate: float,
+    discount_factor: float,
+) -> None:
+    """Nudge the Q-value of ``action`` towards the TD target, in place."""
+    q_values[action] += learning_rate * (reward + discount_factor * next_q - q_values[action])
+
+
 class QLearningAgent:
     """
     Our learning agent that grows into a Connect Four player.
@@ -23,13 +39,19 @@ class QLearningAgent:
     things out randomly, then gradually learns what works and what doesn't.
     """
 
-    def __init__(self, config: AgentConfig):
-        """Get ready to learn!"""
+    def __init__(self, config: AgentConfig, seed: Optional[int] = None):
+        """
+        Get ready to learn!
+
+        Pass a ``seed`` to make our dice rolls repeatable.
+        """
         self.config = config
         self.q_table = SparseQTable()
         self.epsilon = config.initial_epsilon
+        self._random = random.Random(seed)  # For rolling the dice one game at a time
+        self._rng = np.random.default_rng(seed)  # ...and for many games at once
 
-    def choose_action(self, state: GameState) -> int:
+    def choose_action(self, state: StateLike) -> int:
         """
         Pick the next move to make.
 
@@ -39,47 +61,104 @@ class QLearningAgent:
         """
         valid_moves = state.get_valid_moves()
 
-        # Time to try something new?
-        if random.random() < self.epsilon:
-            return random.choice(valid_moves)
+        # Time to try something new? A roll below epsilon is itself spread
+        # evenly, so the same roll also tells us which move to try.
+        roll = self._random.random()
+        if roll < self.epsilon:
+            count = len(valid_moves)
+            return valid_moves[min(int(roll / self.epsilon * count), count - 1)]
+
+        # Or use what we've learned, only looking at moves we're allowed to make
+        q_values = self.q_table.get_row(state)[valid_moves]
+        return valid_moves[int(q_values.argmax())]
+
+    def choose_actions(self, states: List[StateLike]) -> List[int]:
+        """
+        Pick the next move for several games at once.
+
+        Instead of deciding game by game, we roll the explore-or-exploit dice
+        for every game in one go, line up all the Q-values in a single table
+        and pick the best valid move of every row at once.
+        """
+        if len(states) < 2:
+            return [self.choose_action(state) for state in states]
+
+        # Flatten every game's valid moves into one array (plus where each game starts)
+        counts = np.array([len(state.valid_moves) for state in states])
+        starts = np.cumsum(counts) - counts
+        valid_cols = np.fromiter(
+            chain.from_iterable(state.valid_moves for state in states),
+            dtype=np.intp,
+            count=int(counts.sum()),
+        )
 
-        # Or use what we've learned
-        q_values = [self.q_table.get_value(state, action) for action in range(7)]
+        # Use what we've learned: best valid move per game
+        q_values = np.array([self.q_table.get_row(state) for state in states])
+        valid = np.zeros(q_values.shape, dtype=bool)
+        valid[np.repeat(np.arange(len(states)), counts), valid_cols] = True
+        best = np.where(valid, q_values, -np.inf).argmax(axis=1)
 
-        # Can't pick invalid moves!
-        for i in range(7):
-            if i not in valid_moves:
-                q_values[i] = float("-inf")
+        # ...or try something new: a random valid move per game
+        random_picks = valid_cols[starts + (self._rng.random(len(states)) * counts).astype(np.intp)]
 
-        return int(np.argmax(q_values))
+        explore = self._rng.random(len(states)) < self.epsilon
+        return np.where(explore, random_picks, best).tolist()
 
-    def learn(self, state: GameState, action: int, reward: float, next_state: GameState) -> None:
+    def learn(self, state: StateLike, action: int, reward: float, next_state: StateLike) -> None:
         """
         Learn from what happened after our move.
 
         This is like reflecting on a game move. We think about what we did,
         what happened next, and how we could do better next time!
         """
-        # What did we think about this move before?
-        current_q = self.q_table.get_value(state, action)
-
         # What's the best outcome possible from here?
         next_q = (
-            0
+            0.0
             if next_state.game_over
-            else max(self.q_table.get_value(next_state, a) for a in next_state.get_valid_moves())
+            else float(self.q_table.get_row(next_state)[next_state.get_valid_moves()].max())
         )
 
-        # Update our understanding
-        new_q = current_q + self.config.learning_rate * (
-            reward + self.config.discount_factor * next_q - current_q
+        # Update our understanding and remember what we learned
+        td_update(
+            self.q_table.get_writable_row(state),
+            action,
+            reward,
+            next_q,
+            self.config.learning_rate,
+            self.config.discount_factor,
         )
 
-        # Remember what we learned
-        self.q_table.set_value(state, action, new_q)
+    def learn_episode(self, trajectory: List[Tuple[StateLike, int, float]]) -> None:
+        """
+        Learn from a whole game at once, after it's over.
 
-        # Gradually become more strategic
-        self.epsilon = max(self.config.min_epsilon, self.epsilon * self.config.epsilon_decay)
+        We walk back from the final move, so every move gets credited with
+        the actual (discounted) outcome of the game that followed it, in
+        a single update per move.
+        """
+        future_return = 0.0
+        for state, action, reward in reversed(trajectory):
+            # With next_q set to what followed, the TD target is exactly this move's return
+            td_update(
+                self.q_table.get_writable_row(state),
+                action,
+                reward,
+                future_return,
+                self.config.learning_rate,
+                self.config.discount_factor,
+            )
+            future_return = reward + self.config.discount_factor * future_return
+
+    def decay_epsilon(self) -> None:
+        """
+        Gradually become more strategic.
+
+        Called once at the end of every game rather than after every move,
+        which keeps a bit of arithmetic out of the per-move path.
+        """
+        self.epsilon = max(
+            self.config.min_epsilon, self.epsilon * self.config.epsilon_decay_per_episode
+        )
 
     def save(self, filepath: str) -> None:
         """Save everything we've learned."""
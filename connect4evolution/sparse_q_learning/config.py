@@ -20,7 +20,9 @@ class AgentConfig:
     learning_rate: float = 0.1  # How quickly we learn from new experiences
     discount_factor: float = 0.95  # How much we value future rewards
     initial_epsilon: float = 1.0  # Start with 100% exploration
-    epsilon_decay: float = 0.995  # Gradually reduce exploration
+    # Gradually reduce exploration, once per game. This replaces the old per-move
+    # epsilon_decay of 0.995: our agent makes about 10 moves a game and 0.995 ** 10 ≈ 0.95.
+    epsilon_decay_per_episode: float = 0.95
     min_epsilon: float = 0.01  # Always maintain some exploration
 
     def __post_init__(self):
@@ -29,3 +31,5 @@ class AgentConfig:
             raise ValueError("Learning rate must be between 0 and 1")
         if not (0 <= self.discount_factor <= 1):
             raise ValueError("Discount factor must be between 0 and 1")
+        if not (0 <= self.epsilon_decay_per_episode <= 1):
+            raise ValueError("Epsilon decay per episode must be between 0 and 1")
@@ -5,12 +5,13 @@ Just like how we remember important moments in a game, this system helps
 our agent keep track of what it's learned about different game situations! 💭
 """
 
-import json
-from typing import Dict
+import io
+from typing import Dict, Tuple
 
 import numpy as np
 
-from ..environment.state import GameState
+from ..environment.state import StateLike
+from ..utils.io import atomic_write_bytes
 
 
 class SparseQTable:
@@ -20,53 +21,119 @@ class SparseQTable:
     Instead of trying to remember every possible game situation (which would
     be like trying to memorize every grain of sand on a beach!), we only
     store the situations we've actually seen.
+
+    Connect Four looks the same in a mirror, so a position and its left-right
+    flipped twin share one entry. Rows for a flipped position are handed out
+    reversed, so callers always see moves in their own column order.
     """
 
     def __init__(self):
         """Start with a fresh memory."""
-        self._q_values: Dict[str, np.ndarray] = {}
+        # float32 is plenty of precision for Q-values and halves the memory we need
+        self._q_values: Dict[int, np.ndarray] = {}
         self._default_value = 0.0
+        # Shared row for situations we haven't seen yet (read-only so nobody changes it by accident)
+        self._default_row = np.full(7, self._default_value, dtype=np.float32)
+        self._default_row.setflags(write=False)
 
-    def get_value(self, state: GameState, action: int) -> float:
+    def get_value(self, state: StateLike, action: int) -> float:
         """
         Look up how good we think a move is in a given situation.
 
         Like checking our notes about a similar game we played before!
+        Just looking doesn't create any new notes.
+        """
+        return self.get_row(state)[action]
+
+    def get_row(self, state: StateLike) -> np.ndarray:
         """
-        state_key = self._get_state_key(state)
-        if state_key not in self._q_values:
-            self._q_values[state_key] = np.full(7, self._default_value)
-        return self._q_values[state_key][action]
+        Look up how good we think every move is in a given situation.
 
-    def set_value(self, state: GameState, action: int, value: float) -> None:
+        Handy when we want to compare all our options at once. Situations
+        we've never seen share a single read-only row of default values.
+        """
+        state_key, mirrored = self._get_state_key(state)
+        row = self._q_values.get(state_key, self._default_row)
+        return row[::-1] if mirrored else row
+
+    def set_value(self, state: StateLike, action: int, value: float) -> None:
         """
         Update our memory about how good a move is.
 
         This is like writing in our game journal after we learn
         something new!
         """
-        state_key = self._get_state_key(state)
-        if state_key not in self._q_values:
-            self._q_values[state_key] = np.full(7, self._default_value)
-        self._q_values[state_key][action] = value
+        self.get_writable_row(state)[action] = value
 
-    def _get_state_key(self, state: GameState) -> str:
+    def get_writable_row(self, state: StateLike) -> np.ndarray:
         """
-        Create a unique 'snapshot' of the game situation.
+        Get our notes about a situation so we can update them in place.
 
-        This is like taking a picture of the game board that we can
-        use to find our notes about similar situations later.
+        This is the only place where a new row gets created, the first
+        time we actually learn something about a situation.
+        """
+        state_key, mirrored = self._get_state_key(state)
+        row = self._q_values.get(state_key)
+        if row is None:
+            row = self._q_values[state_key] = np.full(7, self._default_value, dtype=np.float32)
+        # A reversed view, so writes still land in the stored row
+        return row[::-1] if mirrored else row
+
+    def _get_state_key(self, state: StateLike) -> Tuple[int, bool]:
         """
-        return f"{state.board.tobytes()}{state.current_player.value}"
+        Find the 'fingerprint' of the game situation.
+
+        The board already keeps Zobrist hashes of the position and of its
+        mirror image (including whose turn it is). We use the smaller of the
+        two, so both orientations land on the same entry, and report whether
+        that was the mirrored one.
+        """
+        if state.mirrored_hash < state.zobrist_hash:
+            return state.mirrored_hash, True
+        return state.zobrist_hash, False
 
     def save(self, filepath: str) -> None:
-        """Save all our memories to a file for later."""
-        serializable = {key: values.tolist() for key, values in self._q_values.items()}
-        with open(filepath, "w") as f:
-            json.dump(serializable, f)
+        """
+        Save all our memories to a file for later.
+
+        Everything goes into a compressed numpy archive: one array with the
+        state fingerprints and one with their Q-values, so no per-value
+        Python objects get created along the way.
+        """
+        write_q_values(filepath, *self.export_arrays())
+
+    def export_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copy our memories into a pair of arrays: (state keys, Q-value rows).
+
+        The arrays are a snapshot, so they can be written out on another
+        thread while we keep learning.
+        """
+        keys = np.fromiter(self._q_values.keys(), dtype=np.uint64, count=len(self._q_values))
+        values = np.array(list(self._q_values.values()), dtype=np.float32)
+        return keys, values.reshape(len(keys), len(self._default_row))
 
     def load(self, filepath: str) -> None:
         """Load our saved memories."""
-        with open(filepath, "r") as f:
-            serializable = json.load(f)
-        self._q_values = {key: np.array(values) for key, values in serializable.items()}
+        with np.load(filepath) as data:
+            keys, values = data["keys"], data["values"]
+        # Checkpoints store half-precision values; we learn in float32
+        values = values.astype(np.float32, copy=False)
+        self._q_values = dict(zip(keys.tolist(), values))
+
+
+def write_q_values(filepath: str, keys: np.ndarray, values: np.ndarray) -> None:
+    """
+    Write exported Q-table arrays to ``filepath``.
+
+    The archive is built in memory first and then swapped into place, so a
+    crash mid-save never leaves a broken model file behind. Most Q-values
+    are still zero, so compression makes checkpoints less than half the size.
+
+    Q-values are stored as float16. They stay within the reward range (±1),
+    where half precision keeps about three significant digits, which is plenty
+    to pick up where we left off and halves the size of the values on disk.
+    """
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, keys=keys, values=values.astype(np.float16))
+    atomic_write_bytes(filepath, buffer.getvalue())
@@ -6,36 +6,25 @@ with an eager student, we'll guide our AI through countless games, celebrating
 its victories and learning from its mistakes.
 """
 
+import queue
+import random
+import sys
+import threading
 import time
-from dataclasses import dataclass
-from typing import Callable, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from connect4evolution.environment.board import ConnectFourBoard
 from connect4evolution.environment.player import Player
 from connect4evolution.environment.renderer import ConnectFourRenderer
-from connect4evolution.environment.state import GameState
+from connect4evolution.environment.state import BoardSnapshot
 from connect4evolution.sparse_q_learning.agent import QLearningAgent
 from connect4evolution.sparse_q_learning.config import AgentConfig
-
-
-@dataclass
-class TrainingConfig:
-    """Our recipe for a perfect learning environment."""
-
-    episodes: int = 10000  # Number of games to play
-    render_every: int = 1000  # How often to show the game visually
-    save_every: int = 5000  # How often to save our progress
-    eval_every: int = 1000  # How often to test our skills
-    model_path: str = "models/sparse_q_learning.json"
-    render_delay: float = 0.3  # Seconds between moves when rendering
-
-    # Rewards to guide our learning
-    win_reward: float = 1.0
-    lose_reward: float = -1.0
-    draw_reward: float = 0.1
-    invalid_move_reward: float = -0.5
+from connect4evolution.sparse_q_learning.memory import write_q_values
+from connect4evolution.sparse_q_learning.training_config import TrainingConfig
 
 
 class Trainer:
@@ -49,94 +38,278 @@ class Trainer:
     * Saves what we've learned
     """
 
+    # How many recent games our progress reports look at
+    STATS_WINDOW = 100
+
     def __init__(self, config: TrainingConfig):
         """Get ready for a learning adventure!"""
         self.config = config
-        self.board = ConnectFourBoard()
-        self.renderer = ConnectFourRenderer()
+        # One board per game in play; a board is just a few integers, so these are cheap
+        self.boards = [ConnectFourBoard() for _ in range(config.num_envs)]
+        self.renderer: Optional[ConnectFourRenderer] = None  # Opened the first time we render
+        # Plain Python RNG for the opponent: far cheaper per pick than np.random.choice
+        self._rng = random.Random(config.seed)
+        self._reward_table = self._build_reward_table()
 
-        # Create our eager student
+        # While we train, checkpoints are written on a background thread (one at
+        # a time) and progress reports are printed by another, so neither a slow
+        # disk nor a slow terminal holds up training
+        self._saver: Optional[ThreadPoolExecutor] = None
+        self._pending_save: Optional[Future] = None
+        self._last_save = time.monotonic()
+        self._log_queue: queue.Queue = queue.Queue()
+        self._logger: Optional[threading.Thread] = None
+
+        # Create our eager student, with its dice seeded from ours
         agent_config = AgentConfig()
-        self.agent = QLearningAgent(agent_config)
+        self.agent = QLearningAgent(agent_config, seed=self._rng.getrandbits(64))
 
-        # Keep track of our progress
-        self.wins = []
-        self.draws = []
-        self.episode_lengths = []
+        # Keep track of our progress over the most recent games
+        self.wins: Deque[int] = deque(maxlen=self.STATS_WINDOW)
+        self.draws: Deque[int] = deque(maxlen=self.STATS_WINDOW)
+        self.episode_lengths: Deque[int] = deque(maxlen=self.STATS_WINDOW)
+        # Running totals of those windows, so reports don't have to add them up
+        self._win_sum = self._draw_sum = self._length_sum = 0
 
     def train(self, progress_callback: Optional[Callable[[], None]] = None) -> None:
-        """Begin our learning journey!"""
+        """
+        Begin our learning journey!
+
+        We play ``num_envs`` games side by side. The random opponent's replies
+        are folded into the board's step, so every round is our agent's turn in
+        every game: it picks all its moves in one go, and whenever a game ends
+        we learn from it and start the next one on that board.
+        """
         print("🎮 Starting training! Let's watch our AI grow...")
 
-        for episode in range(self.config.episodes):
-            # Time for a new game
-            self.board.reset()
-            moves_made = 0
-            rendering = episode % self.config.render_every == 0
+        self._start_workers()
+        try:
+            self._play_games(progress_callback)
+        finally:
+            self._stop_workers()
+
+    def _play_games(self, progress_callback: Optional[Callable[[], None]]) -> None:
+        """Play all our training games, learning from each one as it ends."""
+        num_envs = len(self.boards)
+        episodes: List[Optional[int]] = [None] * num_envs  # Which game each board is playing
+        states: List[Optional[BoardSnapshot]] = [None] * num_envs  # Where each game stands
+        trajectories: List[list] = [[] for _ in range(num_envs)]  # Our moves in each game
+        moves_made = [0] * num_envs
+        started = finished = 0
+
+        # Look these up once instead of on every move
+        total_episodes = self.config.episodes
+        render_every = self.config.render_every
+        render_delay = self.config.render_delay
+        render_ply_stride = self.config.render_ply_stride
+
+        # Time for some new games
+        for env, board in enumerate(self.boards):
+            if started < total_episodes:
+                board.reset()
+                episodes[env] = started
+                states[env] = board.snapshot()
+                started += 1
 
-            while not self.board.get_state().game_over:
-                state = self.board.get_state()
+        while finished < total_episodes:
+            # Every game in play is waiting on our agent: pick all the moves at once
+            active = [env for env, state in enumerate(states) if state is not None]
+            actions = self.agent.choose_actions([states[env] for env in active])
 
-                if state.current_player == Player.PLAYER_1:
-                    # Our agent's turn
-                    action = self.agent.choose_action(state)
-                    valid_move = self.board.make_move(action)
+            for env, action in zip(active, actions):
+                board = self.boards[env]
+                state = states[env]
 
-                    # Learn from what happened
-                    next_state = self.board.get_state()
-                    reward = self._calculate_reward(valid_move, next_state)
-                    self.agent.learn(state, action, reward, next_state)
+                # Our agent's move, and the random opponent's reply
+                valid_move, next_state = board.step_with_random_opponent(action, self._rng)
+
+                # Remember what happened
+                reward = self._calculate_reward(valid_move, next_state)
+                trajectories[env].append((state, action, reward))
+
+                states[env] = next_state
+                moves_before = moves_made[env]
+                moves_made[env] = next_state.mask.bit_count()
+
+                # Show the game if it's time (every few moves, and always the final position)
+                if episodes[env] % render_every == 0 and (
+                    moves_before // render_ply_stride < moves_made[env] // render_ply_stride
+                    or next_state.game_over
+                ):
+                    self._render(board)
+                    if render_delay:
+                        time.sleep(render_delay)
+
+                if not next_state.game_over:
+                    continue
+
+                # Game over! Let's learn from it and record what happened
+                self._finish_episode(next_state, trajectories[env], moves_made[env])
+                finished += 1
+
+                # Update progress if we have a callback
+                if progress_callback:
+                    progress_callback()
+
+                self._report_progress(finished)
+
+                # Start this board's next game, if we still have games to play
+                trajectories[env] = []
+                moves_made[env] = 0
+                if started < total_episodes:
+                    board.reset()
+                    episodes[env] = started
+                    states[env] = board.snapshot()
+                    started += 1
                 else:
-                    # Random opponent's turn
-                    valid_moves = state.get_valid_moves()
-                    action = np.random.choice(valid_moves)
-                    self.board.make_move(action)
-
-                moves_made += 1
-
-                # Show the game if it's time
-                if rendering:
-                    self.renderer.render(self.board.get_state())
-                    time.sleep(self.config.render_delay)
-
-            # Game over! Let's record what happened
-            final_state = self.board.get_state()
-            if final_state.winner == Player.PLAYER_1:
-                self.wins.append(1)
+                    episodes[env] = None
+                    states[env] = None
+
+    def _start_workers(self) -> None:
+        """Start the checkpoint saver and the progress logger for this training run."""
+        self._saver = ThreadPoolExecutor(max_workers=1)
+        self._logger = threading.Thread(target=self._log_worker, daemon=True)
+        self._logger.start()
+        self._last_save = time.monotonic()
+
+    def _stop_workers(self) -> None:
+        """
+        Wind down our helper threads once training is over.
+
+        We make sure the last checkpoint made it to disk (raising if it didn't)
+        and every report made it to the screen before shutting both down.
+        """
+        try:
+            self._wait_for_save()
+        finally:
+            self._log_queue.put_nowait(None)  # Tells the logger we're done
+            self._logger.join()
+            self._saver.shutdown()
+
+    def _render(self, board: ConnectFourBoard) -> None:
+        """Draw the board, opening the game window the first time we need it."""
+        if self.renderer is None:
+            self.renderer = ConnectFourRenderer()
+        self.renderer.render(board.get_state())
+
+    def _finish_episode(
+        self, final_state: BoardSnapshot, trajectory: list, moves_made: int
+    ) -> None:
+        """Learn from a finished game and add it to our statistics."""
+        self.agent.learn_episode(trajectory)
+        self.agent.decay_epsilon()
+
+        won = 1 if final_state.winner == Player.PLAYER_1 else 0
+        drew = 1 if not final_state.winner else 0
+        self._win_sum += self._record(self.wins, won)
+        self._draw_sum += self._record(self.draws, drew)
+        self._length_sum += self._record(self.episode_lengths, moves_made)
+
+    @staticmethod
+    def _record(window: Deque[int], value: int) -> int:
+        """Add a value to a rolling window and return how much the window's sum changed."""
+        dropped = window[0] if len(window) == window.maxlen else 0
+        window.append(value)
+        return value - dropped
+
+    def _report_progress(self, episodes_done: int) -> None:
+        """Share our progress and save what we've learned when it's time."""
+        if episodes_done % self.STATS_WINDOW == 0:
+            games = len(self.wins)
+            self._log_queue.put_nowait(
+                (
+                    episodes_done,
+                    self._win_sum / games,
+                    self._draw_sum / games,
+                    self._length_sum / games,
+                    self.agent.epsilon,
+                )
+            )
+
+        # Time to save our progress? Either enough games or enough time has passed.
+        if (
+            episodes_done % self.config.save_every == 0
+            or time.monotonic() - self._last_save >= self.config.save_every_seconds
+        ):
+            self._save_checkpoint()
+            self._last_save = time.monotonic()
+
+    def _log_worker(self) -> None:
+        """Print progress reports as they come in, each in a single write, until told to stop."""
+        while (report := self._log_queue.get()) is not None:
+            if isinstance(report, str):
+                sys.stdout.write(report)
             else:
-                self.wins.append(0)
-            self.draws.append(1 if not final_state.winner else 0)
-            self.episode_lengths.append(moves_made)
-
-            # Update progress if we have a callback
-            if progress_callback:
-                progress_callback()
-
-            # Share our progress
-            if (episode + 1) % 100 == 0:
-                recent_wins = np.mean(self.wins[-100:])
-                recent_draws = np.mean(self.draws[-100:])
-                print(f"\nEpisode {episode + 1}")
-                print(f"🎯 Win rate: {recent_wins:.2%}")
-                print(f"🤝 Draw rate: {recent_draws:.2%}")
-                print(f"📊 Average game length: {np.mean(self.episode_lengths[-100:]):.1f} moves")
-                print(f"🎲 Exploration rate: {self.agent.epsilon:.2%}")
-
-            # Time to save our progress?
-            if (episode + 1) % self.config.save_every == 0:
-                self.agent.save(self.config.model_path)
-                print(f"\n💾 Saved model to {self.config.model_path}")
-
-    def _calculate_reward(self, valid_move: bool, state: GameState) -> float:
+                sys.stdout.write(self._format_progress(*report))
+            sys.stdout.flush()
+
+    @staticmethod
+    def _format_progress(
+        episodes_done: int,
+        win_rate: float,
+        draw_rate: float,
+        average_length: float,
+        epsilon: float,
+    ) -> str:
+        """Turn a progress report into the text we show."""
+        return (
+            f"\nEpisode {episodes_done}\n"
+            f"🎯 Win rate: {win_rate:.2%}\n"
+            f"🤝 Draw rate: {draw_rate:.2%}\n"
+            f"📊 Average game length: {average_length:.1f} moves\n"
+            f"🎲 Exploration rate: {epsilon:.2%}\n"
+        )
+
+    def _save_checkpoint(self) -> None:
+        """
+        Save what we've learned, without holding up training.
+
+        We take a snapshot of the Q-table right away, then let a background
+        thread compress and write it while we get on with the next games.
+        """
+        if not self.config.background_save:
+            self.agent.save(self.config.model_path)
+            self._announce_save()
+            return
+
+        self._wait_for_save()  # Never have two saves racing for the same file
+        keys, values = self.agent.q_table.export_arrays()
+        self._pending_save = self._saver.submit(self._write_checkpoint, keys, values)
+
+    def _write_checkpoint(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """Write a Q-table snapshot (on the saver thread), then let everyone know."""
+        write_q_values(self.config.model_path, keys, values)
+        self._announce_save()
+
+    def _announce_save(self) -> None:
+        """Report a checkpoint once it has actually made it to disk."""
+        self._log_queue.put_nowait(f"\n💾 Saved model to {self.config.model_path}\n")
+
+    def _wait_for_save(self) -> None:
+        """Wait for any checkpoint still being written (and surface its errors)."""
+        if self._pending_save is not None:
+            self._pending_save.result()
+            self._pending_save = None
+
+    def _calculate_reward(self, valid_move: bool, state: BoardSnapshot) -> float:
         """Figure out how good (or bad) our last move was."""
-        if not valid_move:
-            return self.config.invalid_move_reward
+        return self._reward_table[(valid_move, state.game_over, state.winner)]
+
+    def _build_reward_table(self) -> Dict[Tuple[bool, bool, Optional[Player]], float]:
+        """
+        Work out every possible reward up front.
 
-        if state.game_over:
-            if state.winner == Player.PLAYER_1:
-                return self.config.win_reward
-            elif state.winner == Player.PLAYER_2:
-                return self.config.lose_reward
-            return self.config.draw_reward
+        A move's reward only depends on whether it was valid, whether the game
+        ended and who won, so one dictionary lookup replaces a chain of ifs.
+        Rewards are stored as floats, even if the config was given whole numbers.
+        """
+        table = {}
+        for game_over in (False, True):
+            for winner in (None, Player.PLAYER_1, Player.PLAYER_2):
+                table[(False, game_over, winner)] = float(self.config.invalid_move_reward)
 
-        return 0.0  # The game continues...
+        table[(True, False, None)] = 0.0  # The game continues...
+        table[(True, True, Player.PLAYER_1)] = float(self.config.win_reward)
+        table[(True, True, Player.PLAYER_2)] = float(self.config.lose_reward)
+        table[(True, True, None)] = float(self.config.draw_reward)
+        return table
@@ -1,4 +1,13 @@
+"""
+Settings for our training sessions.
+
+How many games to play, how often to watch and save, and what each result
+is worth. This is the one home of TrainingConfig, so it can be imported
+without pulling in the trainer and its renderer. 📋
+"""
+
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -8,12 +17,24 @@ class TrainingConfig:
     episodes: int = 10000  # Number of games to play
     render_every: int = 1000  # How often to show the game visually
     save_every: int = 5000  # How often to save our progress
+    save_every_seconds: float = 60.0  # ...and never go longer than this without saving
     eval_every: int = 1000  # How often to test our skills
-    model_path: str = "models/sparse_q_learning.json"
-    render_delay: float = 0.3  # Seconds between moves when rendering
+    model_path: str = "models/sparse_q_learning.npz"
+    render_delay: float = 0.0  # Seconds between moves when rendering
+    render_ply_stride: int = 4  # Only draw every n-th move of a rendered game
+    num_envs: int = 1  # Games played side by side
+    background_save: bool = True  # Write checkpoints without pausing training
+    seed: Optional[int] = None  # Set this to make training runs repeatable
 
     # Rewards to guide our learning
     win_reward: float = 1.0
     lose_reward: float = -1.0
     draw_reward: float = 0.1
     invalid_move_reward: float = -0.5
+
+    def __post_init__(self):
+        """Make sure our settings make sense."""
+        if self.num_envs < 1:
+            raise ValueError("We need at least one game to play (num_envs >= 1)")
+        if self.render_ply_stride < 1:
+            raise ValueError("We need to draw at least every n-th move (render_ply_stride >= 1)")
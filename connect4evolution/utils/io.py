@@ -0,0 +1,21 @@
+"""
+Small file helpers shared across our agents.
+
+Saving a model should never leave a half-written file behind, even if
+training gets interrupted right in the middle of a checkpoint. 💾
+"""
+
+import os
+
+
+def atomic_write_bytes(filepath: str, data: bytes) -> None:
+    """
+    Write ``data`` to ``filepath`` in one go, without ever exposing a partial file.
+
+    We write everything to a temporary file next to the target first, then
+    swap it into place with ``os.replace``, which is atomic on the same filesystem.
+    """
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
@@ -0,0 +1,144 @@
+"""Tests for the bitboard-backed ConnectFourBoard."""
+
+import random
+
+import numpy as np
+import pytest
+
+from connect4evolution.environment.board import ConnectFourBoard
+from connect4evolution.environment.player import Player
+
+ROWS, COLS = 6, 7
+
+
+class ReferenceBoard:
+    """The original grid-based board, kept as a plain reference implementation."""
+
+    def __init__(self):
+        self.board = np.zeros((ROWS, COLS), dtype=int)
+        self.current_player = Player.PLAYER_1
+        self.last_move = None
+        self.game_over = False
+        self.winner = None
+
+    def valid_moves(self) -> list[int]:
+        return [col for col in range(COLS) if self.board[0][col] == Player.EMPTY.value]
+
+    def make_move(self, column: int) -> bool:
+        if self.game_over or column not in self.valid_moves():
+            return False
+        row = max(r for r in range(ROWS) if self.board[r][column] == Player.EMPTY.value)
+        self.board[row][column] = self.current_player.value
+        self.last_move = (row, column)
+        if self._is_win(row, column):
+            self.game_over = True
+            self.winner = self.current_player
+        elif not self.valid_moves():
+            self.game_over = True
+        self.current_player = self.current_player.next_player()
+        return True
+
+    def _is_win(self, row: int, col: int) -> bool:
+        player = self.board[row][col]
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                while 0 <= r < ROWS and 0 <= c < COLS and self.board[r][c] == player:
+                    count += 1
+                    r, c = r + sign * dr, c + sign * dc
+            if count >= 4:
+                return True
+        return False
+
+
+def random_games(count: int, seed: int = 0):
+    """Yield move lists for random games, sprinkled with invalid columns."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield [rng.randrange(-1, COLS + 1) for _ in range(ROWS * COLS + 10)]
+
+
+def winning_cells(mask: int) -> set[tuple[int, int]]:
+    """Decode a winning-stones bitboard into (row, col) cells."""
+    cells = set()
+    while mask:
+        bit = (mask & -mask).bit_length() - 1
+        col, height = divmod(bit, ROWS + 1)
+        cells.add((ROWS - 1 - height, col))
+        mask &= mask - 1
+    return cells
+
+
+def test_matches_reference_board_move_for_move():
+    board = ConnectFourBoard()
+    for moves in random_games(3000):
+        board.reset()
+        reference = ReferenceBoard()
+        for column in moves:
+            assert board.make_move(column) == reference.make_move(column)
+            state = board.get_state()
+            np.testing.assert_array_equal(state.board, reference.board)
+            assert state.current_player == reference.current_player
+            assert state.last_move == reference.last_move
+            assert state.game_over == reference.game_over
+            assert state.winner == reference.winner
+            assert state.get_valid_moves() == reference.valid_moves()
+            assert board.get_valid_moves() == reference.valid_moves()
+
+
+def test_mirrored_hash_matches_mirrored_game():
+    board, mirrored = ConnectFourBoard(), ConnectFourBoard()
+    rng = random.Random(1)
+    for _ in range(500):
+        board.reset()
+        mirrored.reset()
+        while not board.get_state().game_over:
+            column = rng.choice(board.get_valid_moves())
+            board.make_move(column)
+            mirrored.make_move(COLS - 1 - column)
+            state, mirrored_state = board.get_state(), mirrored.get_state()
+            assert state.mirrored_hash == mirrored_state.zobrist_hash
+            assert mirrored_state.mirrored_hash == state.zobrist_hash
+
+
+def test_same_position_hashes_the_same_regardless_of_move_order():
+    first, second = ConnectFourBoard(), ConnectFourBoard()
+    for column in (0, 1, 2, 3):
+        first.make_move(column)
+    for column in (2, 3, 0, 1):
+        second.make_move(column)
+    assert first.get_state().zobrist_hash == second.get_state().zobrist_hash
+    assert first.get_state() == second.get_state()
+
+
+def test_winning_mask_marks_the_winners_stones():
+    board = ConnectFourBoard()
+    rng = random.Random(2)
+    wins = 0
+    for _ in range(1000):
+        board.reset()
+        while not board.get_state().game_over:
+            board.make_move(rng.choice(board.get_valid_moves()))
+        state = board.get_state()
+        cells = winning_cells(state.winning_mask)
+        if state.winner is None:
+            assert not cells
+            continue
+        wins += 1
+        assert len(cells) >= 4
+        assert state.last_move in cells
+        assert all(state.board[row][col] == state.winner.value for row, col in cells)
+    assert wins > 0
+
+
+@pytest.mark.parametrize("column", [-1, COLS])
+def test_rejects_out_of_range_columns(column):
+    board = ConnectFourBoard()
+    assert not board.make_move(column)
+    assert board.get_state().last_move is None
+
+
+def test_rejects_boards_that_do_not_fit_a_bitboard():
+    with pytest.raises(ValueError):
+        ConnectFourBoard(rows=8, cols=8)
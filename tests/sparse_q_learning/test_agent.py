@@ -0,0 +1,59 @@
+"""Tests for the Q-learning agent's move selection."""
+
+import random
+
+import numpy as np
+
+from connect4evolution.environment.board import ConnectFourBoard
+from connect4evolution.sparse_q_learning.agent import QLearningAgent
+from connect4evolution.sparse_q_learning.config import AgentConfig
+
+
+def random_snapshots(count: int, seed: int = 0) -> list:
+    """Snapshots of random mid-game positions, from empty boards to nearly full ones."""
+    rng = random.Random(seed)
+    snapshots = []
+    while len(snapshots) < count:
+        board = ConnectFourBoard()
+        for _ in range(rng.randrange(42)):
+            board.make_move(rng.choice(board.get_valid_moves()))
+            if board.get_state().game_over:
+                break
+        else:
+            snapshots.append(board.snapshot())
+    return snapshots
+
+
+def make_agent(epsilon: float, states: list, seed: int = 0) -> QLearningAgent:
+    """An agent that has opinions about half the given states."""
+    agent = QLearningAgent(AgentConfig(), seed=seed)
+    agent.epsilon = epsilon
+    rng = np.random.default_rng(seed)
+    for state in states[::2]:
+        agent.q_table.get_writable_row(state)[:] = rng.normal(size=7)
+    return agent
+
+
+def test_choose_actions_matches_choose_action_when_greedy():
+    states = random_snapshots(300)
+    agent = make_agent(0.0, states)
+    assert agent.choose_actions(states) == [agent.choose_action(state) for state in states]
+
+
+def test_choose_actions_explores_only_valid_moves():
+    states = random_snapshots(200, seed=1)
+    agent = make_agent(1.0, states)
+    seen = [set() for _ in states]
+    for _ in range(200):
+        for picked, state, columns in zip(agent.choose_actions(states), states, seen):
+            assert picked in state.valid_moves
+            columns.add(picked)
+    # Every valid column of every game gets tried at some point
+    assert all(columns == set(state.valid_moves) for columns, state in zip(seen, states))
+
+
+def test_seeded_agents_choose_alike():
+    states = random_snapshots(50, seed=2)
+    first, second = make_agent(0.5, states, seed=7), make_agent(0.5, states, seed=7)
+    assert first.choose_actions(states) == second.choose_actions(states)
+    assert [first.choose_action(s) for s in states] == [second.choose_action(s) for s in states]
@@ -0,0 +1,89 @@
+"""Tests for the mirror-aware sparse Q-table."""
+
+import random
+
+import numpy as np
+import pytest
+
+from connect4evolution.environment.board import ConnectFourBoard
+from connect4evolution.sparse_q_learning.memory import SparseQTable
+
+
+def play(columns: list[int]) -> ConnectFourBoard:
+    """A board with the given columns played in order."""
+    board = ConnectFourBoard()
+    for column in columns:
+        assert board.make_move(column)
+    return board
+
+
+def random_game_pairs(count: int, seed: int = 0):
+    """Yield (position, mirrored position) snapshots of random, lopsided openings."""
+    rng = random.Random(seed)
+    while count:
+        columns = [rng.randrange(7) for _ in range(rng.randrange(1, 12))]
+        board, mirrored = ConnectFourBoard(), ConnectFourBoard()
+        if not all(board.make_move(c) and mirrored.make_move(6 - c) for c in columns):
+            continue
+        state, mirrored_state = board.snapshot(), mirrored.snapshot()
+        if state.zobrist_hash == state.mirrored_hash:
+            continue  # Symmetric positions are their own mirror image
+        count -= 1
+        yield state, mirrored_state
+
+
+def test_mirrored_positions_share_one_entry():
+    table = SparseQTable()
+    for state, mirrored in random_game_pairs(200):
+        action, value = random.randrange(7), random.uniform(-1, 1)
+        table.set_value(state, action, value)
+        assert table.get_value(state, action) == pytest.approx(value)
+        assert table.get_row(mirrored)[6 - action] == pytest.approx(value)
+        assert table.get_value(mirrored, 6 - action) == pytest.approx(value)
+
+
+def test_writes_through_the_mirror_land_in_the_shared_row():
+    table = SparseQTable()
+    for state, mirrored in random_game_pairs(100, seed=1):
+        table.get_writable_row(mirrored)[1] = 0.5
+        assert table.get_row(state)[5] == pytest.approx(0.5)
+    assert len(table.export_arrays()[0]) <= 100
+
+
+def test_symmetric_positions_are_not_flipped():
+    table = SparseQTable()
+    state = play([3, 3, 2, 2, 4, 4]).snapshot()
+    assert state.zobrist_hash == state.mirrored_hash
+
+    table.set_value(state, 2, 0.75)
+    row = table.get_row(state)
+    assert row[2] == pytest.approx(0.75)
+    assert row[4] == 0.0
+
+
+def test_unseen_states_share_a_read_only_default_row():
+    table = SparseQTable()
+    row = table.get_row(play([0]).snapshot())
+    assert not row.any()
+    with pytest.raises(ValueError):
+        row[0] = 1.0
+    assert len(table.export_arrays()[0]) == 0
+
+
+def test_save_load_round_trip(tmp_path):
+    table = SparseQTable()
+    rng = np.random.default_rng(0)
+    for state, _ in random_game_pairs(300, seed=2):
+        table.get_writable_row(state)[:] = rng.uniform(-1, 1, size=7)
+    keys, values = table.export_arrays()
+
+    path = tmp_path / "q_table.npz"
+    table.save(str(path))
+    loaded = SparseQTable()
+    loaded.load(str(path))
+    loaded_keys, loaded_values = loaded.export_arrays()
+
+    assert loaded_keys.tolist() == keys.tolist()
+    assert loaded_values.dtype == np.float32
+    # Checkpoints store values as float16
+    np.testing.assert_allclose(loaded_values, values, rtol=1e-3, atol=1e-3)
@@ -16,29 +16,34 @@ def compare_performance():
 
     size = 4000  # Larger matrix size
     iterations = 5  # Multiple iterations
+    warmup_iterations = 5  # Discarded runs before we start timing
 
-    # Warm-up run for MPS
-    print("\n--- Warm-up run ---")
+    cpu_device = torch.device("cpu")
     mps_device = torch.device("mps")
-    a_warmup = torch.randn(1000, 1000, device=mps_device)
-    b_warmup = torch.randn(1000, 1000, device=mps_device)
-    for _ in range(3):  # Multiple warm-up iterations
-        c_warmup = torch.matmul(a_warmup, b_warmup)
+
+    # Allocate the operands once, outside the timed region
+    a_cpu = torch.randn(size, size, device=cpu_device)
+    b_cpu = torch.randn(size, size, device=cpu_device)
+    a_mps = torch.randn(size, size, device=mps_device)
+    b_mps = torch.randn(size, size, device=mps_device)
+    torch.mps.synchronize()
+
+    # Warm up both devices the same way
+    print("\n--- Warm-up run ---")
+    for _ in range(warmup_iterations):
+        torch.matmul(a_cpu, b_cpu)
+        torch.matmul(a_mps, b_mps)
         torch.mps.synchronize()
     print("Warm-up complete")
 
     # CPU performance test
     print("\n--- CPU Performance Test ---")
-    cpu_device = torch.device("cpu")
     cpu_times = []
 
     for i in range(iterations):
-        a_cpu = torch.randn(size, size, device=cpu_device)
-        b_cpu = torch.randn(size, size, device=cpu_device)
-
-        start_time = time.time()
-        c_cpu = torch.matmul(a_cpu, b_cpu)
-        cpu_time = time.time() - start_time
+        start_time = time.perf_counter()
+        torch.matmul(a_cpu, b_cpu)
+        cpu_time = time.perf_counter() - start_time
         cpu_times.append(cpu_time)
 
         print(f"  Iteration {i + 1}: {cpu_time:.4f} seconds")
@@ -51,13 +56,10 @@ def compare_performance():
     mps_times = []
 
     for i in range(iterations):
-        a_mps = torch.randn(size, size, device=mps_device)
-        b_mps = torch.randn(size, size, device=mps_device)
-
-        start_time = time.time()
-        c_mps = torch.matmul(a_mps, b_mps)
+        start_time = time.perf_counter()
+        torch.matmul(a_mps, b_mps)
         torch.mps.synchronize()  # Wait for MPS operations to complete
-        mps_time = time.time() - start_time
+        mps_time = time.perf_counter() - start_time
         mps_times.append(mps_time)
 
         print(f"  Iteration {i + 1}: {mps_time:.4f} seconds")
@@ -79,19 +81,20 @@ def compare_performance():
     input_cpu = torch.randn(*input_size, device=cpu_device)
     kernel_cpu = torch.randn(*kernel_size, device=cpu_device)
 
-    start_time = time.time()
-    output_cpu = torch.nn.functional.conv2d(input_cpu, kernel_cpu, padding=1)
-    cpu_conv_time = time.time() - start_time
+    start_time = time.perf_counter()
+    torch.nn.functional.conv2d(input_cpu, kernel_cpu, padding=1)
+    cpu_conv_time = time.perf_counter() - start_time
     print(f"CPU convolution time: {cpu_conv_time:.4f} seconds")
 
     # MPS convolution
     input_mps = torch.randn(*input_size, device=mps_device)
     kernel_mps = torch.randn(*kernel_size, device=mps_device)
+    torch.mps.synchronize()  # Make sure the inputs exist before we start the clock
 
-    start_time = time.time()
-    output_mps = torch.nn.functional.conv2d(input_mps, kernel_mps, padding=1)
+    start_time = time.perf_counter()
+    torch.nn.functional.conv2d(input_mps, kernel_mps, padding=1)
     torch.mps.synchronize()
-    mps_conv_time = time.time() - start_time
+    mps_conv_time = time.perf_counter() - start_time
     print(f"MPS convolution time: {mps_conv_time:.4f} seconds")
 
     print(f"Convolution speedup: {cpu_conv_time / mps_conv_time:.2f}x")